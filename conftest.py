@@ -0,0 +1 @@
+# Mantém a raiz do repositório no sys.path para os testes importarem os módulos
@@ -1,5 +1,6 @@
 import streamlit as st
 import pandas as pd
+from pathlib import Path
 import numpy as np
 from scipy import stats
 from statsmodels.stats.proportion import proportion_confint, proportions_ztest
@@ -8,6 +9,21 @@ import plotly.graph_objects as go
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+from perfil_dados import calcular_perfil, carregar_perfil, sketch_coluna, sketches_grupo
+
+
+# Dados + perfil só são relidos (e o CSV re-hasheado) quando o arquivo muda
+@st.cache_data
+def carregar_dados_local(caminho, mtime, tamanho):
+    dados = pd.read_csv(caminho)
+    return dados, carregar_perfil(caminho, dados)
+
+
+@st.cache_data
+def carregar_dados_url(url):
+    dados = pd.read_csv(url)
+    return dados, calcular_perfil(dados)
+
 
 # Título principal da página
 st.title("📊 Análise de Dados")
@@ -30,7 +46,14 @@ with aba1:
     with sub1:
         st.subheader("Explicação sobre o conjunto de dados")
         url = "https://raw.githubusercontent.com/dayquispe/dashboard-marketing-bancario/refs/heads/main/dados_tratados.csv"
-        dados = pd.read_csv(url)
+        caminho_local = Path(__file__).resolve().parent.parent / "dados_tratados.csv"
+
+        # Perfil pré-calculado (sidecar ao lado do CSV) evita recalcular tudo a cada interação
+        if caminho_local.exists():
+            info = caminho_local.stat()
+            dados, perfil = carregar_dados_local(str(caminho_local), info.st_mtime_ns, info.st_size)
+        else:
+            dados, perfil = carregar_dados_url(url)
         
         st.markdown("""
         Este conjunto de dados vem de uma campanha de marketing de um banco português, 
@@ -119,17 +142,12 @@ with aba2:
 
 
     with sub1:
-        # --- Separar numéricas e categóricas ---
-        numeric_cols = dados.select_dtypes(include=['int64', 'float64']).columns
-        categorical_cols = dados.select_dtypes(include=['object', 'category']).columns
+        # --- Medidas centrais numéricas (lidas do perfil) ---
+        numeric_summary = pd.DataFrame.from_dict(perfil["medidas_numericas"], orient="index")
+        numeric_summary = numeric_summary[['mean', 'median', 'std', 'var', 'mode']]
 
-        # --- Medidas centrais numéricas ---
-        numeric_summary = dados[numeric_cols].agg(['mean', 'median', 'std', 'var']).T
-        numeric_summary['mode'] = dados[numeric_cols].mode().iloc[0]
-
-        # --- Moda das categóricas ---
-        cat_mode_df = dados[categorical_cols].mode()
-        categorical_modes = cat_mode_df.iloc[0] if not cat_mode_df.empty else None
+        # --- Moda das categóricas (lidas do perfil) ---
+        categorical_modes = pd.Series(perfil["modas_categoricas"]) if perfil["modas_categoricas"] else None
 
         # --- Dashboard ---
         st.subheader("Análise de Medidas Centrais")
@@ -221,6 +239,8 @@ with aba2:
             media = dados[col].mean()
             variancia = dados[col].var()
             desvio = dados[col].std()
+            sketch = sketch_coluna(perfil, col)
+            iqr = sketch.iqr()
 
             fig, axes = plt.subplots(1, 2, figsize=(14, 5))
 
@@ -232,8 +252,13 @@ with aba2:
             axes[0].set_title(f"Histograma - {col}")
             axes[0].legend()
 
-            # --- Boxplot para outliers ---
-            sns.boxplot(x=dados[col], ax=axes[1], color="salmon")
+            # --- Boxplot para outliers (quartis e bigodes do sketch, sem ordenar a coluna) ---
+            bp = axes[1].bxp([sketch.estatisticas_boxplot()], orientation="horizontal",
+                             patch_artist=True, widths=0.6)
+            for caixa in bp["boxes"]:
+                caixa.set_facecolor("salmon")
+            axes[1].set_yticks([])
+            axes[1].set_xlabel(col)
             axes[1].set_title(f"Boxplot - {col}")
 
             st.pyplot(fig)
@@ -241,15 +266,15 @@ with aba2:
             # --- Interpretação focada em dispersão ---
             st.markdown(f"📊 **{col.upper()}**")
             if col == "idade":
-                st.markdown(f"- Média: {media:.1f} | DP: {desvio:.1f} | Variância: {variancia:.1f}  \n"
+                st.markdown(f"- Média: {media:.1f} | DP: {desvio:.1f} | Variância: {variancia:.1f} | IQR: {iqr:.1f}  \n"
                             "- Idades concentradas em torno da média (30–50 anos).  \n"
                             "- Outliers acima de 70 anos.")
             elif col == "saldo":
-                st.markdown(f"- Média: {media:.1f} | DP: {desvio:.1f} | Variância: {variancia:.1f}  \n"
+                st.markdown(f"- Média: {media:.1f} | DP: {desvio:.1f} | Variância: {variancia:.1f} | IQR: {iqr:.1f}  \n"
                             "- Grande dispersão: DP bem maior que a média.  \n"
                             "- Forte presença de outliers (saldos muito altos).")
             elif col == "duracao":
-                st.markdown(f"- Média: {media:.1f}s | DP: {desvio:.1f}s | Variância: {variancia:.1f}  \n"
+                st.markdown(f"- Média: {media:.1f}s | DP: {desvio:.1f}s | Variância: {variancia:.1f} | IQR: {iqr:.1f}s  \n"
                             "- A maioria abaixo de 500s, mas há dispersão muito alta.  \n"
                             "- Muitos outliers (ligações de 2000s ou mais).")
             st.markdown("---")
@@ -276,7 +301,13 @@ with aba2:
         with st.expander("💍 Duração das Chamadas por Estado Civil"):
             st.subheader("Boxplot - Duração vs Estado Civil")
             fig, ax = plt.subplots(figsize=(7, 5))
-            sns.boxplot(x="estado_civil", y="duracao", data=dados, palette="Set2", ax=ax)
+            grupos = sketches_grupo(perfil, "estado_civil", "duracao")
+            bp = ax.bxp([sk.estatisticas_boxplot(rotulo=nivel) for nivel, sk in grupos.items()],
+                        patch_artist=True, widths=0.8)
+            for caixa, cor in zip(bp["boxes"], sns.color_palette("Set2", len(grupos))):
+                caixa.set_facecolor(cor)
+            ax.set_xlabel("estado_civil")
+            ax.set_ylabel("duracao")
             ax.set_title("Duração das chamadas por Estado Civil")
             st.pyplot(fig)
 
@@ -291,7 +322,20 @@ with aba2:
         with st.expander("💼 Saldo por Tipo de Trabalho"):
             st.subheader("Distribuição do Saldo por Trabalho")
             fig, ax = plt.subplots(figsize=(10, 5))
-            sns.violinplot(x="trabalho", y="saldo", data=dados, palette="muted", ax=ax)
+            grupos = sketches_grupo(perfil, "trabalho", "saldo")
+            posicoes = range(len(grupos))
+            vp = ax.violin([sk.estatisticas_violino() for sk in grupos.values()], positions=posicoes,
+                           showmedians=True, showextrema=False)
+            for corpo, cor in zip(vp["bodies"], sns.color_palette("muted", len(grupos))):
+                corpo.set_facecolor(cor)
+                corpo.set_alpha(0.8)
+            # Caixa interna com o IQR (quartis do sketch), como no sns.violinplot
+            quartis = np.array([sk.quantil([0.25, 0.75]) for sk in grupos.values()])
+            ax.vlines(posicoes, quartis[:, 0], quartis[:, 1], color="0.2", linewidth=5)
+            vp["cmedians"].set(color="white", zorder=3)
+            ax.set_xticks(posicoes, list(grupos))
+            ax.set_xlabel("trabalho")
+            ax.set_ylabel("saldo")
             ax.set_title("Saldo por Trabalho")
             plt.xticks(rotation=30)
             st.pyplot(fig)
@@ -331,18 +375,7 @@ with aba3:
     # --------------------------
     # Preparação do alvo binário
     # --------------------------
-    def detect_target(dados):
-        candidates = ["y", "deposit", "subscribed", "target", "response"]
-        for c in candidates:
-            if c in dados.columns:
-                if dados[c].dropna().nunique() == 2:
-                    return c
-        for c in dados.columns:
-            if dados[c].dropna().nunique() == 2:
-                return c
-        return None
-    
-    target_col = detect_target(dados)
+    target_col = perfil["alvo"]
     if target_col is None:
         st.error("Não encontrei uma coluna binária de resposta (ex.: 'y', 'deposit'). Verifique o dataset.")
         st.stop()
@@ -352,9 +385,8 @@ with aba3:
     dados["_target_"] = dados[target_col].apply(lambda x: 1 if x in positives or x=="1" else 0)
     st.info(f"Coluna alvo detectada: **{target_col}** (convertida para 0/1 em `_target_`).")
     
-    # colunas categóricas e numéricas
-    cat_cols = [c for c in dados.columns if dados[c].dtype == "object" and c not in [target_col]]
-    num_cols = [c for c in dados.columns if np.issubdtype(dados[c].dtype, np.number) and c != "_target_"]
+    # colunas numéricas (lidas do perfil)
+    num_cols = perfil["colunas_inferencia_numericas"]
     
     # --------------------------
     # Escolha do parâmetro
@@ -398,7 +430,7 @@ with aba3:
         st.divider()
         st.markdown("### Comparação de grupos (duas proporções)")
     
-        small_cats = [c for c in cat_cols if dados[c].nunique()<=8]
+        small_cats = perfil["categoricas_pequenas"]
         if not small_cats:
             st.warning("Não há colunas categóricas com até 8 categorias para comparar.")
         else:
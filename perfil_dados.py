@@ -0,0 +1,322 @@
+"""Perfil pré-calculado do dataset (tipos, cardinalidade e medidas resumo).
+
+O perfil é calculado uma única vez por versão do CSV e salvo como arquivo
+auxiliar (sidecar) ao lado dele, ex.: ``dados_tratados.perfil.json``.
+A página de análise apenas carrega esse arquivo em vez de recalcular tudo
+a cada interação.
+
+Para gerar/atualizar o perfil manualmente:
+
+    python perfil_dados.py dados_tratados.csv
+
+Para CSVs maiores que a memória, o perfil pode ser calculado bloco a bloco
+(medianas passam a vir dos sketches de quantis):
+
+    python perfil_dados.py extracao.csv --chunksize 100000
+"""
+import argparse
+import copy
+import hashlib
+import json
+from itertools import chain
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from sketch_quantis import SketchQuantis
+
+
+# Incrementar quando o conteúdo do perfil mudar, para invalidar sidecars antigos
+PERFIL_VERSAO = 3
+
+# Erro de rank dos sketches de quantis e colunas numéricas resumidas por grupo
+SKETCH_ERRO = 0.01
+SKETCH_GRUPOS = {"estado_civil": ["duracao"], "trabalho": ["saldo"]}
+
+
+# -------------------
+# FUNÇÕES AUXILIARES
+# -------------------
+def caminho_perfil(caminho_csv):
+    """Caminho do sidecar de perfil correspondente ao CSV."""
+    caminho_csv = Path(caminho_csv)
+    return caminho_csv.with_name(caminho_csv.stem + ".perfil.json")
+
+
+def hash_arquivo(caminho_csv):
+    """Identifica a versão do dataset pelo SHA-256 do conteúdo do CSV."""
+    sha = hashlib.sha256()
+    with open(caminho_csv, "rb") as arquivo:
+        # Lê em blocos para não carregar o CSV inteiro na memória
+        for bloco in iter(lambda: arquivo.read(1 << 20), b""):
+            sha.update(bloco)
+    return sha.hexdigest()
+
+
+def _nativo(valor):
+    # Converte escalares numpy/pandas para tipos aceitos pelo JSON
+    if isinstance(valor, np.generic):
+        valor = valor.item()
+    if isinstance(valor, float) and np.isnan(valor):
+        return None
+    return valor
+
+
+def detect_target(dados):
+    return _alvo_por_cardinalidade(dados.nunique())
+
+
+def _alvo_por_cardinalidade(cardinalidade):
+    # Mesma regra de detect_target, a partir do nunique() (sem NaN) de cada coluna
+    candidates = ["y", "deposit", "subscribed", "target", "response"]
+    for c in candidates:
+        if c in cardinalidade.index:
+            if cardinalidade[c] == 2:
+                return c
+    for c in cardinalidade.index:
+        if cardinalidade[c] == 2:
+            return c
+    return None
+
+
+def grupos_presentes(colunas, grupos=SKETCH_GRUPOS):
+    """Filtra ``grupos`` para as colunas de grupo e de valor que existem nos dados."""
+    return {g: [v for v in vs if v in colunas] for g, vs in grupos.items() if g in colunas}
+
+
+# -------------------
+# SKETCHES DE QUANTIS
+# -------------------
+def construir_sketches(blocos, colunas, grupos=SKETCH_GRUPOS, erro=SKETCH_ERRO):
+    """Monta sketches por coluna e por nível de categoria, bloco a bloco.
+
+    ``blocos`` é qualquer iterável de DataFrames (ex.: ``pd.read_csv(...,
+    chunksize=...)``), então a memória fica limitada ao bloco + sketches.
+    """
+    por_coluna, por_grupo = {}, {}
+    for bloco in blocos:
+        for col in colunas:
+            por_coluna.setdefault(col, SketchQuantis(erro)).atualizar(bloco[col].to_numpy())
+        for grp_col, valores_cols in grupos.items():
+            for valor_col in valores_cols:
+                niveis = por_grupo.setdefault(grp_col, {}).setdefault(valor_col, {})
+                for nivel, serie in bloco.groupby(grp_col, sort=False)[valor_col]:
+                    niveis.setdefault(nivel, SketchQuantis(erro)).atualizar(serie.to_numpy())
+    return por_coluna, por_grupo
+
+
+def mesclar_sketches(a, b):
+    """Combina dois resultados de ``construir_sketches`` (ex.: extrações separadas).
+
+    Retorna um novo resultado; ``a`` e ``b`` não são alterados.
+    """
+    por_coluna, por_grupo = copy.deepcopy(a)
+    for col, sketch in b[0].items():
+        por_coluna.setdefault(col, SketchQuantis(k=sketch.k)).mesclar(sketch)
+    for grp_col, valores in b[1].items():
+        for valor_col, niveis in valores.items():
+            destino = por_grupo.setdefault(grp_col, {}).setdefault(valor_col, {})
+            for nivel, sketch in niveis.items():
+                destino.setdefault(nivel, SketchQuantis(k=sketch.k)).mesclar(sketch)
+    return por_coluna, por_grupo
+
+
+def sketches_para_dict(por_coluna, por_grupo):
+    return {
+        "colunas": {col: sk.para_dict() for col, sk in por_coluna.items()},
+        "grupos": {
+            grp_col: {
+                valor_col: {nivel: sk.para_dict() for nivel, sk in niveis.items()}
+                for valor_col, niveis in valores.items()
+            }
+            for grp_col, valores in por_grupo.items()
+        },
+    }
+
+
+def sketch_coluna(perfil, col):
+    """Sketch de uma coluna a partir do perfil carregado."""
+    return SketchQuantis.de_dict(perfil["sketches"]["colunas"][col])
+
+
+def sketches_grupo(perfil, grp_col, valor_col):
+    """Sketches de ``valor_col`` por nível de ``grp_col``, na ordem de aparição.
+
+    Níveis sem nenhum valor (ex.: só NaN) são omitidos; se o grupo não
+    existir no dataset, retorna ``{}``.
+    """
+    niveis = perfil["sketches"]["grupos"].get(grp_col, {}).get(valor_col, {})
+    return {nivel: SketchQuantis.de_dict(sk) for nivel, sk in niveis.items() if sk["n"]}
+
+
+# -------------------
+# CÁLCULO DO PERFIL
+# -------------------
+def _montar_perfil(dtypes, numeric_summary, categorical_modes, cardinalidade,
+                   sketches, linhas):
+    # Monta o dicionário do perfil (comum ao cálculo completo e ao por blocos)
+    numeric_cols = [c for c, t in dtypes.items() if t in ('int64', 'float64')]
+    categorical_cols = [c for c, t in dtypes.items() if t == 'object' or isinstance(t, pd.CategoricalDtype)]
+
+    # --- Preparação da inferência ---
+    target_col = _alvo_por_cardinalidade(cardinalidade)
+    cat_cols = [c for c, t in dtypes.items() if t == "object" and c != target_col]
+    num_cols = [c for c, t in dtypes.items() if np.issubdtype(t, np.number)]
+
+    return {
+        "colunas_numericas": numeric_cols,
+        "colunas_categoricas": categorical_cols,
+        "medidas_numericas": {
+            col: {medida: _nativo(v) for medida, v in linha.items()}
+            for col, linha in numeric_summary.iterrows()
+        },
+        "modas_categoricas": {col: _nativo(v) for col, v in categorical_modes.items()},
+        "cardinalidade": {col: _nativo(v) for col, v in cardinalidade.items()},
+        "alvo": target_col,
+        "colunas_inferencia_numericas": num_cols,
+        "categoricas_pequenas": [c for c in cat_cols if cardinalidade[c] <= 8],
+        "sketches": sketches_para_dict(*sketches),
+        "linhas": linhas,
+    }
+
+
+def calcular_perfil(dados):
+    """Calcula o perfil completo de um DataFrame."""
+    # --- Separar numéricas e categóricas ---
+    numeric_cols = dados.select_dtypes(include=['int64', 'float64']).columns
+    categorical_cols = dados.select_dtypes(include=['object', 'category']).columns
+
+    # --- Medidas centrais numéricas (exatas: o perfil é calculado uma vez por versão) ---
+    numeric_summary = dados[numeric_cols].agg(['mean', 'median', 'std', 'var']).T
+    numeric_summary['mode'] = dados[numeric_cols].mode().iloc[0]
+
+    # --- Moda das categóricas ---
+    cat_mode_df = dados[categorical_cols].mode()
+    categorical_modes = cat_mode_df.iloc[0] if not cat_mode_df.empty else pd.Series(dtype=object)
+
+    # --- Sketches de quantis (quartis e box plots sem ordenar as colunas na página) ---
+    sketches = construir_sketches([dados], numeric_cols, grupos_presentes(dados.columns))
+
+    return _montar_perfil(dados.dtypes, numeric_summary, categorical_modes, dados.nunique(),
+                          sketches, len(dados))
+
+
+def _combinar_momentos(momentos, serie):
+    # Combina (n, média, M2) com um novo bloco (Chan et al.), para média/variância em streaming
+    n_a, media_a, m2_a = momentos
+    serie = serie.dropna()
+    n_b = len(serie)
+    if not n_b:
+        return momentos
+    media_b = serie.mean()
+    m2_b = ((serie - media_b) ** 2).sum()
+    n = n_a + n_b
+    delta = media_b - media_a
+    return n, media_a + delta * n_b / n, m2_a + m2_b + delta ** 2 * n_a * n_b / n
+
+
+def _moda(contagens):
+    # Menor valor entre os mais frequentes, como em DataFrame.mode().iloc[0]
+    if contagens.empty:
+        return np.nan
+    return contagens[contagens == contagens.max()].index.min()
+
+
+def calcular_perfil_blocos(blocos):
+    """Calcula o perfil a partir de blocos de DataFrame (ex.: ``pd.read_csv(..., chunksize=...)``).
+
+    Média, desvio e variância são acumulados em streaming e as medianas vêm
+    dos sketches de quantis (mesclados bloco a bloco). Modas e cardinalidade
+    usam contagens de valores, cuja memória cresce com o número de valores
+    distintos e não com o número de linhas. Os tipos das colunas são os do
+    primeiro bloco.
+    """
+    blocos = iter(blocos)
+    primeiro = next(blocos)
+    numeric_cols = primeiro.select_dtypes(include=['int64', 'float64']).columns
+    grupos = grupos_presentes(primeiro.columns)
+
+    linhas = 0
+    momentos = {c: (0, 0.0, 0.0) for c in numeric_cols}
+    contagens = {c: pd.Series(dtype=float) for c in primeiro.columns}
+    sketches = None
+    for bloco in chain([primeiro], blocos):
+        linhas += len(bloco)
+        for c in numeric_cols:
+            momentos[c] = _combinar_momentos(momentos[c], bloco[c])
+        for c in primeiro.columns:
+            contagens[c] = contagens[c].add(bloco[c].value_counts(), fill_value=0)
+        parcial = construir_sketches([bloco], numeric_cols, grupos)
+        sketches = parcial if sketches is None else mesclar_sketches(sketches, parcial)
+
+    # --- Medidas centrais numéricas (medianas aproximadas pelos sketches) ---
+    por_coluna = sketches[0]
+    numeric_summary = pd.DataFrame({
+        c: {
+            'mean': momentos[c][1] if momentos[c][0] else np.nan,
+            'median': por_coluna[c].mediana(),
+            'std': np.sqrt(momentos[c][2] / (momentos[c][0] - 1)) if momentos[c][0] > 1 else np.nan,
+            'var': momentos[c][2] / (momentos[c][0] - 1) if momentos[c][0] > 1 else np.nan,
+            'mode': _moda(contagens[c]),
+        }
+        for c in numeric_cols
+    }).T
+
+    categorical_cols = primeiro.select_dtypes(include=['object', 'category']).columns
+    categorical_modes = pd.Series({c: _moda(contagens[c]) for c in categorical_cols}, dtype=object)
+    cardinalidade = pd.Series({c: len(contagens[c]) for c in primeiro.columns})
+
+    return _montar_perfil(primeiro.dtypes, numeric_summary, categorical_modes, cardinalidade,
+                          sketches, linhas)
+
+
+def gerar_perfil(caminho_csv, dados=None, chunksize=None):
+    """Calcula o perfil do CSV e grava o sidecar ao lado dele.
+
+    Com ``chunksize`` (e sem ``dados``), o CSV é lido em blocos e nunca
+    carregado inteiro na memória.
+    """
+    if dados is not None:
+        perfil = calcular_perfil(dados)
+    elif chunksize:
+        perfil = calcular_perfil_blocos(pd.read_csv(caminho_csv, chunksize=chunksize))
+    else:
+        perfil = calcular_perfil(pd.read_csv(caminho_csv))
+    perfil["versao"] = PERFIL_VERSAO
+    perfil["sha256"] = hash_arquivo(caminho_csv)
+
+    try:
+        caminho_perfil(caminho_csv).write_text(
+            json.dumps(perfil, ensure_ascii=False, separators=(",", ":")), encoding="utf-8"
+        )
+    except OSError:
+        # Ambiente somente leitura: segue com o perfil em memória
+        pass
+    return perfil
+
+
+def carregar_perfil(caminho_csv, dados=None, chunksize=None):
+    """Carrega o sidecar se corresponder à versão atual do CSV; senão, o regenera."""
+    sidecar = caminho_perfil(caminho_csv)
+    if sidecar.exists():
+        try:
+            perfil = json.loads(sidecar.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            perfil = None
+        if (perfil is not None
+                and perfil.get("versao") == PERFIL_VERSAO
+                and perfil.get("sha256") == hash_arquivo(caminho_csv)):
+            return perfil
+    return gerar_perfil(caminho_csv, dados, chunksize)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gera o sidecar de perfil de um ou mais CSVs.")
+    parser.add_argument("arquivos", nargs="*", default=["dados_tratados.csv"])
+    parser.add_argument("--chunksize", type=int, default=None,
+                        help="lê o CSV em blocos de N linhas (CSVs maiores que a memória)")
+    args = parser.parse_args()
+    for arquivo in args.arquivos:
+        gerar_perfil(arquivo, chunksize=args.chunksize)
+        print(f"Perfil gravado em {caminho_perfil(arquivo)}")
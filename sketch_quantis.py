@@ -0,0 +1,192 @@
+"""Sketch de quantis KLL (Karnin, Lang e Liberty) com memória limitada.
+
+Mantém uma amostra ponderada de tamanho O(k) de uma coluna numérica e
+responde medianas, quartis e estatísticas de box plot/violino sem ordenar
+a coluna inteira. Sketches são mescláveis, então podem ser montados bloco
+a bloco (``pd.read_csv(..., chunksize=...)``) ou em extrações separadas e
+combinados depois.
+"""
+import numpy as np
+from scipy import stats
+
+
+def k_para_erro(erro):
+    """Menor k cujo erro de rank normalizado (aprox. empírica do KLL) é <= ``erro``."""
+    if not 0 < erro < 1:
+        raise ValueError("O erro deve estar entre 0 e 1.")
+    return max(8, int(np.ceil((2.296 / erro) ** (1 / 0.9723))))
+
+
+def erro_para_k(k):
+    """Erro de rank normalizado esperado para um dado k."""
+    return 2.296 / k ** 0.9723
+
+
+class SketchQuantis:
+    """Sketch KLL mesclável para quantis aproximados.
+
+    ``erro`` é o erro de rank desejado (ex.: 0.01 → o quantil retornado
+    para q está entre os quantis exatos q ± 0.01, com alta probabilidade).
+    """
+
+    C = 2 / 3
+
+    def __init__(self, erro=0.01, k=None, semente=0):
+        self.k = k if k is not None else k_para_erro(erro)
+        self.niveis = [np.empty(0)]
+        self.n = 0
+        self.minimo = np.inf
+        self.maximo = -np.inf
+        self._rng = np.random.default_rng(semente)
+
+    # -------------------
+    # CONSTRUÇÃO
+    # -------------------
+    def _capacidade(self, h):
+        altura = len(self.niveis) - h - 1
+        return max(2, int(np.ceil(self.k * self.C ** altura)))
+
+    def _comprimir(self):
+        # Compacta o nível mais baixo que estourou a capacidade até caber no limite
+        while sum(len(nivel) for nivel in self.niveis) >= sum(
+                self._capacidade(h) for h in range(len(self.niveis))):
+            for h in range(len(self.niveis)):
+                if len(self.niveis[h]) >= self._capacidade(h):
+                    if h + 1 == len(self.niveis):
+                        self.niveis.append(np.empty(0))
+                    nivel = np.sort(self.niveis[h])
+                    resto = nivel[:len(nivel) % 2]
+                    promovidos = nivel[len(resto):][self._rng.integers(2)::2]
+                    self.niveis[h] = resto
+                    self.niveis[h + 1] = np.concatenate([self.niveis[h + 1], promovidos])
+                    break
+
+    def atualizar(self, valores):
+        """Adiciona valores (NaN são ignorados)."""
+        valores = np.asarray(valores, dtype=float).ravel()
+        valores = valores[~np.isnan(valores)]
+        if valores.size:
+            self.n += valores.size
+            self.minimo = min(self.minimo, valores.min())
+            self.maximo = max(self.maximo, valores.max())
+            self.niveis[0] = np.concatenate([self.niveis[0], valores])
+            self._comprimir()
+        return self
+
+    def mesclar(self, outro):
+        """Incorpora outro sketch (ex.: de outro bloco de dados)."""
+        if outro.k != self.k:
+            raise ValueError("Só é possível mesclar sketches com o mesmo k.")
+        while len(self.niveis) < len(outro.niveis):
+            self.niveis.append(np.empty(0))
+        for h, nivel in enumerate(outro.niveis):
+            self.niveis[h] = np.concatenate([self.niveis[h], nivel])
+        self.n += outro.n
+        self.minimo = min(self.minimo, outro.minimo)
+        self.maximo = max(self.maximo, outro.maximo)
+        self._comprimir()
+        return self
+
+    # -------------------
+    # CONSULTAS
+    # -------------------
+    def itens(self):
+        """Valores retidos e seus pesos, ordenados por valor."""
+        valores = np.concatenate(self.niveis)
+        pesos = np.concatenate([np.full(len(nivel), 2.0 ** h) for h, nivel in enumerate(self.niveis)])
+        ordem = np.argsort(valores, kind="stable")
+        return valores[ordem], pesos[ordem]
+
+    def quantil(self, q):
+        """Quantil(is) aproximado(s) para q em [0, 1]."""
+        q = np.asarray(q, dtype=float)
+        if self.n == 0:
+            return np.full(q.shape, np.nan)[()]
+        valores, pesos = self.itens()
+        acumulado = np.cumsum(pesos)
+        idx = np.searchsorted(acumulado, q * acumulado[-1], side="left")
+        resultado = valores[np.clip(idx, 0, len(valores) - 1)]
+        resultado = np.where(q <= 0, self.minimo, np.where(q >= 1, self.maximo, resultado))
+        return resultado[()]
+
+    def mediana(self):
+        return float(self.quantil(0.5))
+
+    def iqr(self):
+        q1, q3 = self.quantil([0.25, 0.75])
+        return float(q3 - q1)
+
+    def media(self):
+        valores, pesos = self.itens()
+        return float(np.average(valores, weights=pesos)) if self.n else np.nan
+
+    def estatisticas_boxplot(self, whis=1.5, rotulo=None):
+        """Estatísticas no formato de ``Axes.bxp``.
+
+        Quartis e mediana têm o erro de rank do sketch. Os bigodes só são
+        exatos quando coincidem com o mínimo/máximo; se os dados passam dos
+        limites de ``whis``·IQR, o bigode é o item retido mais extremo dentro
+        do limite, portanto também aproximado. Os outliers (``fliers``) são os
+        itens retidos fora dos bigodes: uma amostra representativa, não todos
+        os pontos.
+        """
+        if self.n == 0:
+            raise ValueError("Sketch vazio: não há estatísticas de box plot.")
+        q1, med, q3 = self.quantil([0.25, 0.5, 0.75])
+        valores, _ = self.itens()
+        lim_inf, lim_sup = q1 - whis * (q3 - q1), q3 + whis * (q3 - q1)
+
+        dentro = valores[(valores >= lim_inf) & (valores <= lim_sup)]
+        whislo = self.minimo if self.minimo >= lim_inf else (dentro.min() if dentro.size else q1)
+        whishi = self.maximo if self.maximo <= lim_sup else (dentro.max() if dentro.size else q3)
+
+        fliers = np.unique(np.concatenate([
+            valores[(valores < whislo) | (valores > whishi)],
+            [v for v in (self.minimo, self.maximo) if v < whislo or v > whishi],
+        ]))
+        return {
+            "label": rotulo,
+            "med": med, "q1": q1, "q3": q3,
+            "whislo": whislo, "whishi": whishi,
+            "fliers": fliers,
+        }
+
+    def estatisticas_violino(self, pontos=100):
+        """Estatísticas no formato de ``Axes.violin`` (KDE ponderada dos itens retidos)."""
+        if self.n == 0:
+            raise ValueError("Sketch vazio: não há estatísticas de violino.")
+        valores, pesos = self.itens()
+        if np.unique(valores).size > 1:
+            coords = np.linspace(self.minimo, self.maximo, pontos)
+            vals = stats.gaussian_kde(valores, weights=pesos)(coords)
+        else:
+            # Coluna constante: KDE é degenerada, desenha um pico estreito no valor
+            meia_largura = max(abs(self.minimo) * 0.01, 0.5)
+            coords = np.linspace(self.minimo - meia_largura, self.maximo + meia_largura, pontos)
+            vals = np.exp(-0.5 * ((coords - self.minimo) / (meia_largura / 3)) ** 2)
+        return {
+            "coords": coords, "vals": vals,
+            "mean": self.media(), "median": self.mediana(),
+            "min": self.minimo, "max": self.maximo,
+        }
+
+    # -------------------
+    # SERIALIZAÇÃO
+    # -------------------
+    def para_dict(self):
+        return {
+            "k": self.k,
+            "n": self.n,
+            "min": float(self.minimo) if self.n else None,
+            "max": float(self.maximo) if self.n else None,
+            "niveis": [nivel.tolist() for nivel in self.niveis],
+        }
+
+    @classmethod
+    def de_dict(cls, dados):
+        sketch = cls(k=dados["k"])
+        sketch.n = dados["n"]
+        if sketch.n:
+            sketch.minimo, sketch.maximo = dados["min"], dados["max"]
+        sketch.niveis = [np.asarray(nivel, dtype=float) for nivel in dados["niveis"]]
+        return sketch
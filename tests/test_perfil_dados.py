@@ -0,0 +1,144 @@
+import hashlib
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import perfil_dados
+from perfil_dados import calcular_perfil, caminho_perfil, carregar_perfil, hash_arquivo
+
+
+@pytest.fixture
+def amostra():
+    rng = np.random.default_rng(1)
+    n = 300
+    return pd.DataFrame({
+        "idade": rng.integers(18, 90, n),
+        "trabalho": rng.choice(["admin.", "technician", "services", "retired"], n),
+        "estado_civil": rng.choice(["married", "single", "divorced"], n),
+        "saldo": rng.normal(1500, 3000, n).round(),
+        "duracao": rng.integers(1, 2000, n),
+        "mes": rng.choice(["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep"], n),
+        "deposito": rng.choice(["yes", "no"], n),
+    })
+
+
+@pytest.fixture
+def csv(tmp_path, amostra):
+    caminho = tmp_path / "dados.csv"
+    amostra.to_csv(caminho, index=False)
+    return caminho
+
+
+def test_hash_arquivo(csv):
+    assert hash_arquivo(csv) == hashlib.sha256(csv.read_bytes()).hexdigest()
+
+
+def test_sidecar_valido_e_reutilizado(csv, monkeypatch):
+    perfil = carregar_perfil(csv)
+    assert caminho_perfil(csv).exists()
+
+    def falha(*args, **kwargs):
+        raise AssertionError("o perfil não deveria ser recalculado")
+    monkeypatch.setattr(perfil_dados, "calcular_perfil", falha)
+
+    assert carregar_perfil(csv) == perfil
+
+
+def test_csv_alterado_regera(csv, amostra):
+    antigo = carregar_perfil(csv)
+    amostra.iloc[:150].to_csv(csv, index=False)
+
+    novo = carregar_perfil(csv)
+
+    assert novo["sha256"] != antigo["sha256"]
+    assert novo["linhas"] == 150
+    assert json.loads(caminho_perfil(csv).read_text(encoding="utf-8"))["sha256"] == novo["sha256"]
+
+
+def test_versao_diferente_regera(csv):
+    perfil = carregar_perfil(csv)
+    perfil["versao"] = perfil_dados.PERFIL_VERSAO - 1
+    perfil["alvo"] = "marcador"
+    caminho_perfil(csv).write_text(json.dumps(perfil), encoding="utf-8")
+
+    novo = carregar_perfil(csv)
+
+    assert novo["versao"] == perfil_dados.PERFIL_VERSAO
+    assert novo["alvo"] != "marcador"
+
+
+def test_sidecar_corrompido_regera(csv):
+    caminho_perfil(csv).write_text("{não é json", encoding="utf-8")
+
+    perfil = carregar_perfil(csv)
+
+    assert perfil["versao"] == perfil_dados.PERFIL_VERSAO
+    assert json.loads(caminho_perfil(csv).read_text(encoding="utf-8")) == perfil
+
+
+def test_perfil_igual_ao_calculo_da_pagina(amostra):
+    perfil = calcular_perfil(amostra)
+
+    # Cálculos que a página fazia a cada interação
+    numeric_cols = amostra.select_dtypes(include=['int64', 'float64']).columns
+    categorical_cols = amostra.select_dtypes(include=['object', 'category']).columns
+    numeric_summary = amostra[numeric_cols].agg(['mean', 'median', 'std', 'var']).T
+    numeric_summary['mode'] = amostra[numeric_cols].mode().iloc[0]
+    categorical_modes = amostra[categorical_cols].mode().iloc[0]
+    target_col = next(c for c in amostra.columns if amostra[c].dropna().nunique() == 2)
+    cat_cols = [c for c in amostra.columns if amostra[c].dtype == "object" and c not in [target_col]]
+    small_cats = [c for c in cat_cols if amostra[c].nunique() <= 8]
+
+    lido = pd.DataFrame.from_dict(perfil["medidas_numericas"], orient="index")
+    pd.testing.assert_frame_equal(lido[numeric_summary.columns], numeric_summary, check_dtype=False)
+    assert perfil["modas_categoricas"] == categorical_modes.to_dict()
+    assert perfil["alvo"] == target_col == "deposito"
+    assert perfil["categoricas_pequenas"] == small_cats == ["trabalho", "estado_civil"]
+    assert perfil["colunas_inferencia_numericas"] == list(numeric_cols)
+
+
+def test_perfil_sem_colunas_de_grupo():
+    # Mesmo layout do bank.csv original (colunas em inglês, sem estado_civil/trabalho)
+    dados = pd.DataFrame({
+        "age": [30, 40, 50, 60],
+        "marital": ["married", "single", "married", "divorced"],
+        "balance": [10.0, 20.0, 30.0, 40.0],
+        "deposit": ["yes", "no", "no", "yes"],
+    })
+
+    perfil = calcular_perfil(dados)
+
+    assert perfil["sketches"]["grupos"] == {}
+    assert perfil_dados.sketches_grupo(perfil, "estado_civil", "duracao") == {}
+    assert perfil_dados.sketch_coluna(perfil, "balance").n == 4
+
+
+def test_grupos_presentes():
+    assert perfil_dados.grupos_presentes(["trabalho", "saldo", "duracao"]) == {"trabalho": ["saldo"]}
+    assert perfil_dados.grupos_presentes(["estado_civil", "saldo"]) == {"estado_civil": []}
+
+
+def test_perfil_por_blocos_igual_ao_completo(csv, amostra):
+    completo = calcular_perfil(amostra)
+    blocos = perfil_dados.calcular_perfil_blocos(pd.read_csv(csv, chunksize=70))
+
+    for chave in ("colunas_numericas", "colunas_categoricas", "modas_categoricas", "cardinalidade",
+                  "alvo", "colunas_inferencia_numericas", "categoricas_pequenas", "linhas"):
+        assert blocos[chave] == completo[chave]
+    for col, medidas in completo["medidas_numericas"].items():
+        por_blocos = blocos["medidas_numericas"][col]
+        for medida in ("mean", "std", "var", "mode"):
+            assert por_blocos[medida] == pytest.approx(medidas[medida])
+        # Mediana vem do sketch: erro de rank dentro do configurado
+        rank = (amostra[col] <= por_blocos["median"]).mean()
+        assert abs(rank - 0.5) <= perfil_dados.SKETCH_ERRO + 1 / len(amostra)
+    for nivel, sketch in perfil_dados.sketches_grupo(blocos, "estado_civil", "duracao").items():
+        assert sketch.n == (amostra["estado_civil"] == nivel).sum()
+
+
+def test_gerar_perfil_por_blocos(csv):
+    perfil = perfil_dados.gerar_perfil(csv, chunksize=50)
+    assert perfil["linhas"] == 300
+    assert carregar_perfil(csv) == json.loads(caminho_perfil(csv).read_text(encoding="utf-8"))
@@ -0,0 +1,121 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from perfil_dados import construir_sketches, mesclar_sketches
+from sketch_quantis import SketchQuantis, erro_para_k, k_para_erro
+
+
+QS = np.linspace(0.01, 0.99, 99)
+
+
+def erro_rank(exatos, estimados, qs):
+    # Distância entre o rank do valor estimado e o rank pedido
+    ordenados = np.sort(exatos)
+    baixo = np.searchsorted(ordenados, estimados, side="left") / len(ordenados)
+    alto = np.searchsorted(ordenados, estimados, side="right") / len(ordenados)
+    return np.maximum(np.maximum(baixo - qs, qs - alto), 0).max()
+
+
+@pytest.fixture
+def dados():
+    rng = np.random.default_rng(42)
+    return rng.lognormal(mean=6, sigma=1.5, size=50_000)
+
+
+def test_k_para_erro_e_inverso():
+    for erro in (0.05, 0.01, 0.005):
+        assert erro_para_k(k_para_erro(erro)) <= erro
+    with pytest.raises(ValueError):
+        k_para_erro(0)
+
+
+def test_erro_de_rank_dentro_do_garantido(dados):
+    sketch = SketchQuantis(erro=0.01).atualizar(dados)
+    assert erro_rank(dados, sketch.quantil(QS), QS) <= 0.01
+    assert abs(sketch.mediana() - np.quantile(dados, 0.5)) < np.quantile(dados, 0.51) - np.quantile(dados, 0.49)
+
+
+def test_memoria_limitada(dados):
+    sketch = SketchQuantis(erro=0.01).atualizar(dados)
+    assert sum(len(nivel) for nivel in sketch.niveis) < 3 * sketch.k
+
+
+def test_blocos_e_mescla(dados):
+    por_blocos = SketchQuantis(erro=0.01)
+    for bloco in np.array_split(dados, 13):
+        por_blocos.atualizar(bloco)
+
+    partes = [SketchQuantis(erro=0.01, semente=i).atualizar(b) for i, b in enumerate(np.array_split(dados, 7))]
+    mesclado = partes[0]
+    for parte in partes[1:]:
+        mesclado.mesclar(parte)
+
+    for sketch in (por_blocos, mesclado):
+        assert sketch.n == len(dados)
+        assert sketch.minimo == dados.min()
+        assert sketch.maximo == dados.max()
+        assert erro_rank(dados, sketch.quantil(QS), QS) <= 0.01
+
+
+def test_mesclar_exige_mesmo_k():
+    with pytest.raises(ValueError):
+        SketchQuantis(k=100).mesclar(SketchQuantis(k=200))
+
+
+def test_ida_e_volta_dict(dados):
+    sketch = SketchQuantis().atualizar(dados)
+    copia = SketchQuantis.de_dict(sketch.para_dict())
+    assert (copia.k, copia.n, copia.minimo, copia.maximo) == (sketch.k, sketch.n, sketch.minimo, sketch.maximo)
+    np.testing.assert_array_equal(copia.quantil(QS), sketch.quantil(QS))
+
+
+def test_sketch_vazio():
+    sketch = SketchQuantis().atualizar([np.nan])
+    assert sketch.n == 0
+    assert np.isnan(sketch.mediana())
+    assert SketchQuantis.de_dict(sketch.para_dict()).n == 0
+    with pytest.raises(ValueError):
+        sketch.estatisticas_boxplot()
+    with pytest.raises(ValueError):
+        sketch.estatisticas_violino()
+
+
+def test_coluna_constante():
+    sketch = SketchQuantis().atualizar(np.full(1000, 7.0))
+    box = sketch.estatisticas_boxplot()
+    assert box["q1"] == box["med"] == box["q3"] == box["whislo"] == box["whishi"] == 7.0
+    assert box["fliers"].size == 0
+    violino = sketch.estatisticas_violino()
+    assert violino["vals"].max() > 0
+    assert violino["coords"].min() < 7.0 < violino["coords"].max()
+
+
+def test_boxplot_proximo_do_exato(dados):
+    box = SketchQuantis(erro=0.01).atualizar(dados).estatisticas_boxplot()
+    q1, med, q3 = np.quantile(dados, [0.25, 0.5, 0.75])
+    assert erro_rank(dados, np.array([box["q1"], box["med"], box["q3"]]), np.array([0.25, 0.5, 0.75])) <= 0.01
+    assert box["whislo"] == dados.min()
+    assert box["whishi"] <= q3 + 1.5 * (q3 - q1) * 1.1
+    assert (box["fliers"] > box["whishi"]).all()
+
+
+def test_construir_e_mesclar_sketches_por_grupo():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        "grupo": rng.choice(["a", "b", "c"], size=6000),
+        "valor": rng.normal(size=6000),
+    })
+    inteiro = construir_sketches([df], ["valor"], grupos={"grupo": ["valor"]})
+    metade_a = construir_sketches([df.iloc[:3000]], ["valor"], grupos={"grupo": ["valor"]})
+    metade_b = construir_sketches([df.iloc[3000:]], ["valor"], grupos={"grupo": ["valor"]})
+    n_antes = metade_a[0]["valor"].n
+
+    por_coluna, por_grupo = mesclar_sketches(metade_a, metade_b)
+
+    assert metade_a[0]["valor"].n == n_antes
+    assert por_coluna["valor"].n == inteiro[0]["valor"].n == len(df)
+    for nivel, serie in df.groupby("grupo")["valor"]:
+        sketch = por_grupo["grupo"]["valor"][nivel]
+        assert sketch.n == len(serie)
+        assert erro_rank(serie.to_numpy(), sketch.quantil(QS), QS) <= 0.01